@@ -1,10 +1,108 @@
 # The Pillow library is required to run this script.
 # Install it with: pip install Pillow
-from PIL import Image, ImageDraw
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+import os
+import re
 import sys
 import argparse
 
-def create_icon_background(hex_color: str, size: int = 1024, depth_factor: float = 1.5, foreground_path: str = None):
+# A hex color code: six hexadecimal digits with an optional leading '#' and an optional
+# trailing alpha pair (#RRGGBBAA), which is ignored since the background is opaque.
+HEX_COLOR_PATTERN = re.compile(r'#?([0-9A-Fa-f]{6})(?:[0-9A-Fa-f]{2})?')
+
+def hex_to_rgb(hex_color: str):
+    """
+    Converts a hexadecimal color code to an (r, g, b) tuple.
+
+    Args:
+        hex_color (str): The hexadecimal color code, with or without a leading '#'.
+                         An 8-digit #RRGGBBAA code is accepted and its alpha ignored.
+
+    Returns:
+        tuple: The (r, g, b) color.
+
+    Raises:
+        ValueError: If hex_color is not six (or eight) hexadecimal digits.
+    """
+    match = HEX_COLOR_PATTERN.fullmatch(hex_color)
+    if not match:
+        raise ValueError(f"unknown color specifier: '{hex_color}' (expected a hex code like #007AFF)")
+    hex_digits = match.group(1)
+    return tuple(int(hex_digits[i:i+2], 16) for i in (0, 2, 4))
+
+@lru_cache(maxsize=256)
+def create_gradient_colors(hex_color: str, depth_factor: float):
+    """
+    Calculates the colors of the gradient for a base color.
+
+    The results are cached per process. This only helps library callers that generate
+    several sizes of the same color in one process; --batch mode runs each color in a
+    separate worker process, so it does not benefit.
+
+    Args:
+        hex_color (str): The hexadecimal color code for the icon background.
+        depth_factor (float): A multiplier to control the intensity of the gradient effect.
+
+    Returns:
+        tuple: The (base_color, light_shade_rgb, dark_shade_rgb) tuples, as (r, g, b).
+    """
+    base_color = hex_to_rgb(hex_color)
+
+    # Calculate a darker shade for the bottom and a lighter shade for the top of
+    # the gradient based on the depth_factor.
+    offset = int(20 * depth_factor)
+    dark_shade_rgb = tuple(max(0, c - offset) for c in base_color)
+    light_shade_rgb = tuple(min(255, c + offset) for c in base_color)
+    return base_color, light_shade_rgb, dark_shade_rgb
+
+def create_gradient_image(base_color: tuple, light_shade_rgb: tuple, dark_shade_rgb: tuple, size: int):
+    """
+    Builds the square linear gradient image.
+
+    The gradient transitions from a lighter shade at the top to the base color
+    in the middle, then on to a slightly darker shade at the bottom. Every row is
+    a single color, so only a one-pixel-wide column of row colors is computed and
+    Pillow stretches it across the width.
+
+    Args:
+        base_color (tuple): The (r, g, b) color in the middle of the gradient.
+        light_shade_rgb (tuple): The (r, g, b) color at the top of the gradient.
+        dark_shade_rgb (tuple): The (r, g, b) color at the bottom of the gradient.
+        size (int): The resolution of the square image in pixels.
+
+    Returns:
+        Image.Image: The RGB gradient image.
+    """
+    # Row colors are computed in exact integer arithmetic: with t = i / (size / 2),
+    # the color start + delta * t becomes start + (delta * 2i) // size, which floors
+    # exactly as truncating the float result would, without any float rounding.
+    split = (size + 1) // 2  # number of rows with i < size / 2
+    dlight = tuple(b - l for b, l in zip(base_color, light_shade_rgb))
+    ddark = tuple(d - b for d, b in zip(dark_shade_rgb, base_color))
+
+    # The top half (from 0 to size/2) interpolates from light_shade to base_color,
+    # the bottom half (from size/2 to size) from base_color to dark_shade.
+    # Each half is evaluated only for its own rows, and each channel is clamped to
+    # 0-255, as a negative depth_factor can push it out of range.
+    rows = []
+    for i in range(split):
+        rows.append(bytes(min(255, max(0, l + dl * 2 * i // size))
+                          for l, dl in zip(light_shade_rgb, dlight)))
+    for i in range(split, size):
+        rows.append(bytes(min(255, max(0, b + dd * (2 * i - size) // size))
+                          for b, dd in zip(base_color, ddark)))
+    column = b''.join(rows)
+
+    # Stretch the one-pixel-wide column across the width. A nearest-neighbour resize
+    # copies each row color exactly and runs entirely inside Pillow.
+    column_image = Image.frombuffer('RGB', (1, size), column, 'raw', 'RGB', 0, 1)
+    return column_image.resize((size, size), Image.Resampling.NEAREST)
+
+def create_icon_background(hex_color: str, size: int = 1024, depth_factor: float = 1.5, foreground_path: str = None,
+                           fast: bool = False, output=None):
     """
     Generates a square image with a subtle depth-like gradient.
 
@@ -14,49 +112,25 @@ def create_icon_background(hex_color: str, size: int = 1024, depth_factor: float
         depth_factor (float): A multiplier to control the intensity of the gradient effect.
                               Higher values create a more pronounced depth effect.
         foreground_path (str): Optional path to a transparent PNG to overlay on the background.
+        fast (bool): Use the fastest PNG compression level. The file is slightly larger,
+                     but saving is much quicker.
+        output (str or file object): Where to write the PNG. Either a file path or a
+                                     writable binary file object (e.g., io.BytesIO).
+                                     Defaults to "icon_background_{size}.png".
+
+    Returns:
+        bool: True if the image was generated and saved, False if an error occurred.
     """
     # Ensure the hex code starts with a '#'.
     if not hex_color.startswith('#'):
         hex_color = '#' + hex_color
 
     try:
-        # Create a new blank square image.
-        img = Image.new('RGB', (size, size), hex_color)
-        draw = ImageDraw.Draw(img)
-
-        # Convert the hex color to RGB.
-        base_color = tuple(int(hex_color.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
-
-        # Calculate a darker shade for the top of the gradient based on the depth_factor.
-        dark_offset = int(20 * depth_factor)
-        dark_shade_rgb = tuple(max(0, c - dark_offset) for c in base_color)
-        
-        # Calculate a lighter shade for the bottom of the gradient based on the depth_factor.
-        light_offset = int(20 * depth_factor)
-        light_shade_rgb = tuple(min(255, c + light_offset) for c in base_color)
+        # Work out the base, lighter and darker shades of the gradient.
+        base_color, light_shade_rgb, dark_shade_rgb = create_gradient_colors(hex_color, depth_factor)
 
         # Draw the linear gradient.
-        # The gradient transitions from a lighter shade at the top to a darker shade
-        # in the middle, then back to the base color at the bottom.
-        for i in range(size):
-            # Calculate the color for the current row based on its position.
-            # This creates a smooth transition.
-            
-            # The top half (from 0 to size/2)
-            if i < size / 2:
-                # Interpolate from light_shade to base_color
-                r = int(light_shade_rgb[0] + (base_color[0] - light_shade_rgb[0]) * (i / (size / 2)))
-                g = int(light_shade_rgb[1] + (base_color[1] - light_shade_rgb[1]) * (i / (size / 2)))
-                b = int(light_shade_rgb[2] + (base_color[2] - light_shade_rgb[2]) * (i / (size / 2)))
-            # The bottom half (from size/2 to size)
-            else:
-                # Interpolate from base_color to a slightly darker color
-                r = int(base_color[0] + (dark_shade_rgb[0] - base_color[0]) * ((i - size / 2) / (size / 2)))
-                g = int(base_color[1] + (dark_shade_rgb[1] - base_color[1]) * ((i - size / 2) / (size / 2)))
-                b = int(base_color[2] + (dark_shade_rgb[2] - base_color[2]) * ((i - size / 2) / (size / 2)))
-
-            # Draw a single line of the calculated color.
-            draw.line([(0, i), (size, i)], fill=(r, g, b))
+        img = create_gradient_image(base_color, light_shade_rgb, dark_shade_rgb, size)
 
         # If a foreground image is provided, overlay it on the background
         if foreground_path:
@@ -72,40 +146,113 @@ def create_icon_background(hex_color: str, size: int = 1024, depth_factor: float
                 if foreground.size != (size, size):
                     foreground = foreground.resize((size, size), Image.Resampling.LANCZOS)
                 
-                # Convert background to RGBA for compositing
-                img = img.convert('RGBA')
-                
-                # Composite the foreground onto the background
-                img = Image.alpha_composite(img, foreground)
-                
-                # Convert back to RGB for PNG saving
-                img = img.convert('RGB')
+                # The background is fully opaque, so blending the foreground through its own
+                # alpha mask gives the same result as alpha compositing, without converting
+                # the background to RGBA and back.
+                img.paste(foreground, (0, 0), mask=foreground)
                 
             except FileNotFoundError:
                 print(f"Warning: Foreground image '{foreground_path}' not found. Proceeding without foreground.", file=sys.stderr)
             except Exception as e:
                 print(f"Warning: Could not process foreground image '{foreground_path}': {e}. Proceeding without foreground.", file=sys.stderr)
 
-        # Define the output file name.
-        output_filename = f"icon_background_{size}.png"
-        img.save(output_filename)
-        print(f"Successfully generated and saved {output_filename}")
+        # Define the output file name unless the caller provided a path or file object.
+        if output is None:
+            output = f"icon_background_{size}.png"
+        # zlib level 6 is Pillow's default; level 1 trades a little file size for speed.
+        img.save(output, format='PNG', compress_level=1 if fast else 6)
+        if isinstance(output, (str, os.PathLike)):
+            print(f"Successfully generated and saved {output}")
+        return True
 
     except Exception as e:
         print(f"An error occurred: {e}", file=sys.stderr)
+        return False
+
+def create_icon_backgrounds(hex_colors: list, size: int = 1024, depth_factor: float = 1.5, foreground_path: str = None,
+                            fast: bool = False, max_workers: int = None):
+    """
+    Generates icon backgrounds for several colors in parallel.
+
+    Each color is independent, so the colors are spread across worker processes.
+    Each image is saved as "icon_background_{HEX}_{size}.png", where HEX is the
+    upper-case hex code without a '#', so the files for different colors do not
+    overwrite each other. Invalid color codes are reported and skipped, and a color
+    that appears more than once is only generated once.
+
+    Args:
+        hex_colors (list): The hexadecimal color codes to generate backgrounds for.
+        size (int): The resolution of the square images in pixels.
+        depth_factor (float): A multiplier to control the intensity of the gradient effect.
+        foreground_path (str): Optional path to a transparent PNG to overlay on every background.
+        fast (bool): Use the fastest PNG compression level.
+        max_workers (int): The number of worker processes (default: the number of CPUs).
+
+    Returns:
+        bool: True if every color was generated and saved, False if any color was
+              invalid or failed.
+    """
+    success = True
+
+    # Normalise each color to its upper-case hex digits, which also name the output file.
+    normalised = []
+    for hex_color in hex_colors:
+        try:
+            rgb = hex_to_rgb(hex_color)
+        except ValueError as e:
+            print(f"An error occurred: {e}", file=sys.stderr)
+            success = False
+            continue
+        normalised.append(''.join(f'{c:02X}' for c in rgb))
+
+    # Skip repeated colors so no two workers write the same file.
+    colors = list(dict.fromkeys(normalised))
+    outputs = [f"icon_background_{hex_digits}_{size}.png" for hex_digits in colors]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(create_icon_background, colors, repeat(size), repeat(depth_factor),
+                                    repeat(foreground_path), repeat(fast), outputs))
+    return success and all(results)
 
 if __name__ == "__main__":
     # Use argparse to handle command-line arguments.
     parser = argparse.ArgumentParser(description="Generate an iOS-style icon background with a gradient.")
-    parser.add_argument("hex_color", help="The hexadecimal color code (e.g., #007AFF).")
+    parser.add_argument("hex_color", nargs="?", default=None,
+                        help="The hexadecimal color code (e.g., #007AFF).")
     parser.add_argument("-s", "--size", type=int, default=1024,
                         help="The resolution of the square image in pixels (default: 1024).")
     parser.add_argument("-d", "--depth_factor", type=float, default=3.0,
                         help="A multiplier to control the intensity of the gradient effect (default: 3.0).")
     parser.add_argument("-f", "--foreground", type=str, default=None,
                         help="Optional path to a transparent PNG to overlay on the background.")
+    parser.add_argument("--fast", action="store_true",
+                        help="Use faster PNG compression at the cost of a slightly larger file.")
+    parser.add_argument("-o", "--output", type=str, default=None,
+                        help="Output file path (default: icon_background_{size}.png).")
+    parser.add_argument("-b", "--batch", type=str, default=None,
+                        help="Path to a text file with one hex color code per line. "
+                             "The backgrounds are generated in parallel.")
 
     args = parser.parse_args()
-    
-    # Call the function with the parsed arguments.
-    create_icon_background(args.hex_color, args.size, args.depth_factor, args.foreground)
+
+    if args.batch:
+        if args.hex_color or args.output:
+            parser.error("--batch cannot be combined with a hex_color or --output.")
+
+        # Read one hex color code per line, skipping blank lines.
+        try:
+            with open(args.batch) as batch_file:
+                hex_colors = [line.strip() for line in batch_file if line.strip()]
+        except OSError as e:
+            print(f"An error occurred: Could not read batch file '{args.batch}': {e}", file=sys.stderr)
+            sys.exit(1)
+
+        if not create_icon_backgrounds(hex_colors, args.size, args.depth_factor, args.foreground, args.fast):
+            sys.exit(1)
+    else:
+        if not args.hex_color:
+            parser.error("a hex_color or --batch file is required.")
+
+        # Call the function with the parsed arguments.
+        if not create_icon_background(args.hex_color, args.size, args.depth_factor, args.foreground, args.fast,
+                                      args.output):
+            sys.exit(1)